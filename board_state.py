@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import NamedTuple
 import uuid
 
 
@@ -7,39 +8,54 @@ class Player(Enum):
     WHITE = "white"
 
 
-class BoardState:
+# Looking up a member on the Enum class is several times slower than reading
+# a module global, so hot paths compare next_player against these by identity
+BLACK = Player.BLACK
+WHITE = Player.WHITE
+
+
+class BoardState(NamedTuple):
     """
     Represents the state of an Othello game board.
-    
+
     The board is represented using two 64-bit bitmaps for black and white pieces.
+    BoardState is immutable: moves produce a new state, which is cheap to
+    build as a tuple and shares the parent's user and session_id.
+
+    Fields:
+        user: Username string (required)
+        black: 64-bit integer bitmap representing black pieces (default: starting position)
+        white: 64-bit integer bitmap representing white pieces (default: starting position)
+        next_player: The player who makes the next move (default: BLACK)
+        session_id: Session UUID string (default: None; see new_game)
     """
-    
+
     # Starting position: center 4 squares with pieces at positions 27, 28, 35, 36
     # Black at positions 28 (e4) and 35 (d5)
     # White at positions 27 (d4) and 36 (e5)
     DEFAULT_BLACK = (1 << 28) | (1 << 35)
     DEFAULT_WHITE = (1 << 27) | (1 << 36)
-    
-    def __init__(
-        self,
-        user: str,
-        black: int = DEFAULT_BLACK,
-        white: int = DEFAULT_WHITE,
-        next_player: Player = Player.BLACK,
-        session_id: str | None = None
-    ):
+
+    user: str
+    black: int = DEFAULT_BLACK
+    white: int = DEFAULT_WHITE
+    next_player: Player = Player.BLACK
+    session_id: str | None = None
+
+    @classmethod
+    def new_game(cls, user: str) -> 'BoardState':
         """
-        Initialize a BoardState.
-        
+        Create the starting position for a new game with a fresh session UUID.
+
         Args:
-            user: Username string (required)
-            black: 64-bit integer bitmap representing black pieces (default: starting position)
-            white: 64-bit integer bitmap representing white pieces (default: starting position)
-            next_player: The player who makes the next move (default: BLACK)
-            session_id: Session UUID string (default: auto-generated)
+            user: Username string
+        """
+        return cls(user=user, session_id=str(uuid.uuid4()))
+
+    def pieces(self) -> tuple[int, int]:
+        """
+        Return the bitmaps as (player pieces, opponent pieces) for the side to move.
         """
-        self.user = user
-        self.black = black
-        self.white = white
-        self.next_player = next_player
-        self.session_id = session_id if session_id is not None else str(uuid.uuid4())
+        if self.next_player is BLACK:
+            return self.black, self.white
+        return self.white, self.black
@@ -0,0 +1,555 @@
+"""
+Bitboard kernels for the search hot paths.
+
+These functions work on raw 64-bit bitmaps (player pieces, opponent pieces)
+instead of BoardState, so they can be compiled with Numba. Numba is optional:
+when it is not installed the same functions run as plain Python.
+
+Compiled kernels take and return uint64, where shifts and complements wrap
+on their own. Plain Python ints do not wrap, so the code never uses ~ and
+keeps every left shift bounded by a 64-bit mask; complements are taken as
+x ^ FULL_MASK. The masks cost nothing once compiled. Callers always pass
+and receive ordinary Python ints.
+"""
+
+try:
+    from numba import int64, njit, prange, uint64
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    int64 = int
+    uint64 = int
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Bit layout: position = row * 8 + col, so a shift of 1 moves one column
+# east/west, 8 moves one row south/north, and 7/9 move along the diagonals.
+# Constants are uint64 so compiled code never mixes signed and unsigned ints.
+FULL_MASK = uint64((1 << 64) - 1)
+
+# Every square except the A and H files. Runs of opponent pieces along a
+# horizontal or diagonal ray can never include an edge-file square (the ray
+# would leave the board), so masking the opponent with this also stops
+# shifted bits from wrapping around to the other side of the board.
+INNER_FILES_MASK = uint64(0x7e7e7e7e7e7e7e7e)
+
+# Shift amounts for the four axes; each is swept both left and right.
+SHIFTS = (1, 7, 8, 9)
+
+# Evaluation squares
+CORNERS = (0, 7, 56, 63)
+CORNER_ADJACENT = (
+    (1, 8, 9),      # Top-left corner
+    (6, 14, 15),    # Top-right corner
+    (48, 49, 57),   # Bottom-left corner
+    (54, 55, 62),   # Bottom-right corner
+)
+EDGES = (1, 2, 3, 4, 5, 6, 8, 16, 24, 32, 40, 48, 15, 23, 31, 39, 47, 55, 57, 58, 59, 60, 61, 62)
+
+
+def _squares_mask(squares):
+    mask = 0
+    for square in squares:
+        mask |= 1 << square
+    return uint64(mask)
+
+
+# Each evaluation feature is a popcount of the pieces under one of these masks
+CORNER_MASK = _squares_mask(CORNERS)
+CORNER_MASKS = tuple(_squares_mask((corner,)) for corner in CORNERS)
+CORNER_ADJACENT_MASKS = tuple(_squares_mask(adjacent) for adjacent in CORNER_ADJACENT)
+ALL_CORNER_ADJACENT_MASK = _squares_mask(sum(CORNER_ADJACENT, ()))
+EDGE_MASK = _squares_mask(EDGES)
+
+# Score of a won game. Both searches score finished games as +/-WIN_SCORE or
+# 0, so strategy_negamax and negamax_nb return the same values.
+WIN_SCORE = 1000.0
+
+# Search bound, read as a global rather than calling float('inf') per node
+INF = float('inf')
+
+
+if HAVE_NUMBA:
+    _M1 = uint64(0x5555555555555555)
+    _M2 = uint64(0x3333333333333333)
+    _M4 = uint64(0x0f0f0f0f0f0f0f0f)
+    _H01 = uint64(0x0101010101010101)
+
+    @njit("int64(uint64)", cache=True)
+    def popcount(x):
+        """Count set bits (SWAR, since int.bit_count is unavailable in Numba)."""
+        x = x - ((x >> uint64(1)) & _M1)
+        x = (x & _M2) + ((x >> uint64(2)) & _M2)
+        x = (x + (x >> uint64(4))) & _M4
+        return (x * _H01) >> uint64(56)
+else:
+    popcount = int.bit_count
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def legal_mask_nb(player_pieces, opponent_pieces):
+    """
+    Compute the bitmap of all legal moves using Dumb7Fill sweeps.
+
+    For each of the 8 directions, the player's pieces are flood-filled through
+    adjacent opponent pieces; any empty square directly past such a run is a
+    legal move.
+
+    Args:
+        player_pieces: Bitmap of current player's pieces
+        opponent_pieces: Bitmap of opponent's pieces
+
+    Returns:
+        Bitmap with one bit set per legal move position
+    """
+    empty_squares = (player_pieces | opponent_pieces) ^ FULL_MASK
+    inner_opponent = opponent_pieces & INNER_FILES_MASK
+
+    moves = uint64(0)
+    for axis in SHIFTS:
+        shift = uint64(axis)
+        opponent = opponent_pieces if axis == 8 else inner_opponent
+
+        # A run holds at most 6 opponent pieces, so 5 extensions suffice
+        run = opponent & (player_pieces << shift)
+        run |= opponent & (run << shift)
+        run |= opponent & (run << shift)
+        run |= opponent & (run << shift)
+        run |= opponent & (run << shift)
+        run |= opponent & (run << shift)
+        moves |= empty_squares & (run << shift)
+
+        run = opponent & (player_pieces >> shift)
+        run |= opponent & (run >> shift)
+        run |= opponent & (run >> shift)
+        run |= opponent & (run >> shift)
+        run |= opponent & (run >> shift)
+        run |= opponent & (run >> shift)
+        moves |= empty_squares & (run >> shift)
+
+    return moves
+
+
+# Directions as (row step, column step)
+DIRECTIONS = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+def _build_flip_rays():
+    """
+    Precompute flip lookup tables for every square and direction.
+
+    For each ray leaving a square, the table maps the opponent pieces on the
+    ray (excluding its last square, which can never be flipped) to the run
+    of pieces flipped and the square just past the run that must hold a
+    player piece for the capture to happen.
+    """
+    rays_by_square = []
+    for position in range(64):
+        row, col = divmod(position, 8)
+        rays = []
+        for dr, dc in DIRECTIONS:
+            ray = []
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append(r * 8 + c)
+                r += dr
+                c += dc
+            if len(ray) < 2:
+                continue  # Too short to sandwich anything
+
+            candidates = ray[:-1]
+            ray_mask = 0
+            for square in candidates:
+                ray_mask |= 1 << square
+
+            table = {}
+            for pattern in range(1 << len(candidates)):
+                occupancy = 0
+                for i, square in enumerate(candidates):
+                    if (pattern >> i) & 1:
+                        occupancy |= 1 << square
+                run = 0
+                length = 0
+                while length < len(candidates) and (pattern >> length) & 1:
+                    run |= 1 << candidates[length]
+                    length += 1
+                table[occupancy] = (run, 1 << ray[length] if run else 0)
+            rays.append((ray_mask, table))
+        rays_by_square.append(tuple(rays))
+    return tuple(rays_by_square)
+
+
+if HAVE_NUMBA:
+    @njit("uint64(int64, uint64, uint64)", cache=True)
+    def flips_nb(position, player_pieces, opponent_pieces):
+        """
+        Compute the bitmap of opponent pieces flipped by a move at position.
+
+        Each direction is filled from the move square through adjacent opponent
+        pieces; the run is captured only if a player piece lies just past it.
+        """
+        move_mask = uint64(1) << uint64(position)
+        inner_opponent = opponent_pieces & INNER_FILES_MASK
+
+        flips = uint64(0)
+        for axis in SHIFTS:
+            shift = uint64(axis)
+            opponent = opponent_pieces if axis == 8 else inner_opponent
+
+            run = opponent & (move_mask << shift)
+            run |= opponent & (run << shift)
+            run |= opponent & (run << shift)
+            run |= opponent & (run << shift)
+            run |= opponent & (run << shift)
+            run |= opponent & (run << shift)
+            if player_pieces & (run << shift):
+                flips |= run
+
+            run = opponent & (move_mask >> shift)
+            run |= opponent & (run >> shift)
+            run |= opponent & (run >> shift)
+            run |= opponent & (run >> shift)
+            run |= opponent & (run >> shift)
+            run |= opponent & (run >> shift)
+            if player_pieces & (run >> shift):
+                flips |= run
+
+        return flips
+else:
+    # Interpreted Python pays per operation, so a dict lookup per ray beats
+    # filling each ray with shifts
+    FLIP_RAYS = _build_flip_rays()
+
+    def flips_nb(position: int, player_pieces: int, opponent_pieces: int) -> int:
+        """
+        Compute the bitmap of opponent pieces flipped by a move at position.
+
+        Looks up the opponent run on each ray in FLIP_RAYS; the run is
+        captured only if a player piece lies just past it.
+        """
+        flips = 0
+        for ray_mask, table in FLIP_RAYS[position]:
+            run, stop = table[opponent_pieces & ray_mask]
+            if player_pieces & stop:
+                flips |= run
+        return flips
+
+
+@njit("UniTuple(uint64, 2)(uint64, uint64, int64)", cache=True)
+def apply_move_nb(player_pieces, opponent_pieces, position):
+    """
+    Place a piece at position and flip the captured opponent pieces.
+
+    The move is assumed to be legal.
+
+    Returns:
+        Tuple of (new player pieces, new opponent pieces)
+    """
+    flips = flips_nb(position, player_pieces, opponent_pieces)
+    move_mask = uint64(1) << uint64(position)
+    return player_pieces | flips | move_mask, opponent_pieces ^ flips
+
+
+@njit("float64(uint64, uint64, int64, UniTuple(float64, 5))", cache=True)
+def evaluate_nb(player_pieces, opponent_pieces, total_pieces, weights):
+    """
+    Evaluate a position from the perspective of the side owning player_pieces.
+
+    Uses a combination of factors:
+    - Mobility (number of legal moves)
+    - Corner control (very valuable)
+    - Dangerous squares adjacent to empty corners (heavily penalized)
+    - Edge control
+    - Piece count (weighted less early in game)
+
+    Args:
+        player_pieces: Bitmap of the evaluated player's pieces
+        opponent_pieces: Bitmap of the opponent's pieces
+        total_pieces: Number of pieces on the board; searches track this per
+            ply instead of counting it at every leaf
+        weights: Tuple of (mobility, corners, corner_adjacent, edges, piece_count) weights
+
+    Returns:
+        Score from the player's perspective (positive is better)
+    """
+    mobility_weight, corners_weight, corner_adjacent_weight, edges_weight, piece_count_weight = weights
+    occupied = player_pieces | opponent_pieces
+
+    score = 0.0
+
+    # Mobility - number of legal moves
+    player_mobility = popcount(legal_mask_nb(player_pieces, opponent_pieces))
+    opponent_mobility = popcount(legal_mask_nb(opponent_pieces, player_pieces))
+    if player_mobility + opponent_mobility != 0:
+        score += mobility_weight * (player_mobility - opponent_mobility)
+
+    # Corner control (corners are extremely valuable)
+    player_corners = popcount(player_pieces & CORNER_MASK)
+    opponent_corners = popcount(opponent_pieces & CORNER_MASK)
+    score += corners_weight * (player_corners - opponent_corners)
+
+    # Dangerous squares adjacent to corners (X-squares and C-squares)
+    # Only penalize if the corner is empty
+    if not (occupied & CORNER_MASK):
+        # All corners empty: every adjacent square counts
+        player_adjacent = popcount(player_pieces & ALL_CORNER_ADJACENT_MASK)
+        opponent_adjacent = popcount(opponent_pieces & ALL_CORNER_ADJACENT_MASK)
+        score -= corner_adjacent_weight * (player_adjacent - opponent_adjacent)
+    else:
+        for i in range(4):
+            if occupied & CORNER_MASKS[i]:
+                continue
+            player_adjacent = popcount(player_pieces & CORNER_ADJACENT_MASKS[i])
+            opponent_adjacent = popcount(opponent_pieces & CORNER_ADJACENT_MASKS[i])
+            score -= corner_adjacent_weight * (player_adjacent - opponent_adjacent)
+
+    # Edge control
+    player_edges = popcount(player_pieces & EDGE_MASK)
+    opponent_edges = popcount(opponent_pieces & EDGE_MASK)
+    score += edges_weight * (player_edges - opponent_edges)
+
+    # Piece count (matters more in endgame)
+    piece_weight = total_pieces / 64.0  # Increases as game progresses
+    player_count = popcount(player_pieces)
+    opponent_count = popcount(opponent_pieces)
+    score += piece_weight * piece_count_weight * (player_count - opponent_count)
+
+    return score
+
+
+# Random number generation for playouts. Python's random module is not
+# available in compiled code, so playouts use SplitMix64 to derive
+# independent seeds and xorshift64 to draw from them.
+_GOLDEN_GAMMA = uint64(0x9e3779b97f4a7c15)
+_MIX1 = uint64(0xbf58476d1ce4e5b9)
+_MIX2 = uint64(0x94d049bb133111eb)
+
+
+@njit("uint64(uint64)", cache=True)
+def splitmix64_nb(seed):
+    """Scramble a seed into a well-mixed, non-zero 64-bit value."""
+    z = (seed + _GOLDEN_GAMMA) & FULL_MASK
+    z = ((z ^ (z >> uint64(30))) * _MIX1) & FULL_MASK
+    z = ((z ^ (z >> uint64(27))) * _MIX2) & FULL_MASK
+    z ^= z >> uint64(31)
+    return z if z else _GOLDEN_GAMMA
+
+
+@njit("uint64(uint64)", cache=True)
+def xorshift64_nb(state):
+    """Advance a non-zero xorshift64 state and return the new state."""
+    state ^= (state << uint64(13)) & FULL_MASK
+    state ^= state >> uint64(7)
+    state ^= (state << uint64(17)) & FULL_MASK
+    return state
+
+
+@njit("int64(uint64, uint64, uint64)", cache=True)
+def playout_nb(player_pieces, opponent_pieces, seed):
+    """
+    Play uniformly random moves until the game ends.
+
+    Each move is picked by drawing k below the number of legal moves and
+    skipping to the k-th set bit of the legal move mask, so no move list is
+    ever built.
+
+    Args:
+        player_pieces: Bitmap of the side to move
+        opponent_pieces: Bitmap of the other side
+        seed: Random seed for this playout
+
+    Returns:
+        1 if the side to move wins, -1 if it loses, 0 for a draw
+    """
+    state = splitmix64_nb(seed)
+    sign = 1  # flips every ply so the result is for the starting side
+    consecutive_passes = 0
+
+    while consecutive_passes < 2:
+        moves = legal_mask_nb(player_pieces, opponent_pieces)
+        if not moves:
+            player_pieces, opponent_pieces = opponent_pieces, player_pieces
+            sign = -sign
+            consecutive_passes += 1
+            continue
+
+        consecutive_passes = 0
+        state = xorshift64_nb(state)
+        k = int64(state % uint64(popcount(moves)))
+        for _ in range(k):
+            moves &= moves - uint64(1)
+        lowest = moves & ((moves ^ FULL_MASK) + uint64(1))
+        position = popcount(lowest - uint64(1))
+
+        player_pieces, opponent_pieces = apply_move_nb(player_pieces, opponent_pieces, position)
+        player_pieces, opponent_pieces = opponent_pieces, player_pieces
+        sign = -sign
+
+    player_count = popcount(player_pieces)
+    opponent_count = popcount(opponent_pieces)
+    if player_count == opponent_count:
+        return 0
+    return sign if player_count > opponent_count else -sign
+
+
+@njit("int64(uint64, uint64, int64, uint64)", cache=True, parallel=True, nogil=True)
+def simulate_batch_nb(player_pieces, opponent_pieces, count, seed):
+    """
+    Run count independent random playouts from one position.
+
+    With Numba the playouts are spread across CPU cores.
+
+    Returns:
+        Sum of the playout results for the side to move (see playout_nb)
+    """
+    total = 0
+    for i in prange(count):
+        total += playout_nb(player_pieces, opponent_pieces, seed + uint64(i))
+    return total
+
+
+@njit("float64(uint64, uint64)", cache=True)
+def final_score_nb(player_pieces, opponent_pieces):
+    """Score a finished game: WIN_SCORE, -WIN_SCORE or 0 for the side to move."""
+    player_count = popcount(player_pieces)
+    opponent_count = popcount(opponent_pieces)
+    if player_count > opponent_count:
+        return WIN_SCORE
+    if player_count < opponent_count:
+        return -WIN_SCORE
+    return 0.0
+
+
+@njit("float64(uint64, uint64, int64, float64, float64, int64, UniTuple(float64, 5))", cache=True)
+def negamax_nb(player_pieces, opponent_pieces, depth, alpha, beta, total_pieces, weights):
+    """
+    Negamax with alpha-beta pruning, for whole games played by play_game_nb.
+
+    A leaner strategy_negamax.negamax: there is no transposition table and
+    moves are only ordered corners first. It returns the same scores: once
+    the empty squares fit in the depth, it searches to the end of the game.
+
+    Args:
+        player_pieces: Bitmap of the side to move
+        opponent_pieces: Bitmap of the other side
+        depth: Remaining search depth
+        alpha: Alpha value for pruning
+        beta: Beta value for pruning
+        total_pieces: Number of pieces on the board
+        weights: Tuple of evaluation weights (see evaluate_nb)
+
+    Returns:
+        Score from the side to move's perspective
+    """
+    if 64 - total_pieces <= depth:
+        depth = 64
+    if depth == 0:
+        return evaluate_nb(player_pieces, opponent_pieces, total_pieces, weights)
+
+    moves = legal_mask_nb(player_pieces, opponent_pieces)
+    if not moves:
+        if not legal_mask_nb(opponent_pieces, player_pieces):
+            return final_score_nb(player_pieces, opponent_pieces)
+        return -negamax_nb(opponent_pieces, player_pieces, depth, -beta, -alpha, total_pieces, weights)
+
+    max_score = -INF
+    corner_moves = moves & CORNER_MASK
+    for group in (corner_moves, moves ^ corner_moves):
+        while group:
+            lowest = group & ((group ^ FULL_MASK) + uint64(1))
+            group ^= lowest
+            new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces,
+                                                     popcount(lowest - uint64(1)))
+            score = -negamax_nb(new_opponent, new_player, depth - 1, -beta, -alpha,
+                                total_pieces + 1, weights)
+            if score > max_score:
+                max_score = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                return max_score
+    return max_score
+
+
+@njit("int64(uint64, uint64, UniTuple(float64, 5), UniTuple(float64, 5), int64, uint64)", cache=True)
+def play_game_nb(black, white, weights_black, weights_white, depth, seed):
+    """
+    Play a whole game between two sets of weights, black to move first.
+
+    Each move is chosen as strategy_negamax.choose_move would at a single
+    depth, with negamax_nb below the root and ties broken at random, but
+    the game never leaves compiled code.
+
+    Args:
+        black: Bitmap of black's pieces at the start
+        white: Bitmap of white's pieces at the start
+        weights_black: Evaluation weights for black (see evaluate_nb)
+        weights_white: Evaluation weights for white
+        depth: Search depth for every move
+        seed: Random seed for breaking ties
+
+    Returns:
+        1 if black wins, -1 if white wins, 0 for a draw
+    """
+    state = splitmix64_nb(seed)
+    player_pieces, opponent_pieces = black, white
+    weights, waiting_weights = weights_black, weights_white
+    sign = 1  # 1 while black is to move
+
+    while True:
+        moves = legal_mask_nb(player_pieces, opponent_pieces)
+        if not moves:
+            if not legal_mask_nb(opponent_pieces, player_pieces):
+                break
+            player_pieces, opponent_pieces = opponent_pieces, player_pieces
+            weights, waiting_weights = waiting_weights, weights
+            sign = -sign
+            continue
+
+        total_pieces = popcount(player_pieces | opponent_pieces)
+        best_move = -1
+        best_score = -INF
+        alpha = -INF
+        ties = 0
+        corner_moves = moves & CORNER_MASK
+        for group in (corner_moves, moves ^ corner_moves):
+            while group:
+                lowest = group & ((group ^ FULL_MASK) + uint64(1))
+                group ^= lowest
+                position = popcount(lowest - uint64(1))
+                new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, position)
+                score = -negamax_nb(new_opponent, new_player, depth - 1, -INF, -alpha,
+                                    total_pieces + 1, weights)
+                if score > best_score:
+                    best_score = score
+                    best_move = position
+                    ties = 1
+                    if score > alpha:
+                        alpha = score
+                elif score == best_score:
+                    # Only an upper bound once alpha is set: confirm the tie
+                    # with a full window, then break it as choose_move does
+                    score = -negamax_nb(new_opponent, new_player, depth - 1, -INF, INF,
+                                        total_pieces + 1, weights)
+                    if score == best_score:
+                        ties += 1
+                        state = xorshift64_nb(state)
+                        if state % uint64(ties) == uint64(0):
+                            best_move = position
+
+        player_pieces, opponent_pieces = apply_move_nb(player_pieces, opponent_pieces, best_move)
+        player_pieces, opponent_pieces = opponent_pieces, player_pieces
+        weights, waiting_weights = waiting_weights, weights
+        sign = -sign
+
+    player_count = popcount(player_pieces)
+    opponent_count = popcount(opponent_pieces)
+    if player_count == opponent_count:
+        return 0
+    return sign if player_count > opponent_count else -sign
@@ -1,6 +1,11 @@
 from board_state import BoardState
 
 
+# Cell glyphs indexed by (white bit << 1) | black bit. Black wins if both
+# bits are somehow set, as it always has.
+GLYPHS = ("·", "○", "●", "○")
+
+
 def display_board(board_state: BoardState) -> None:
     """
     Display the Othello board in the console with column letters and row numbers.
@@ -9,19 +14,14 @@ def display_board(board_state: BoardState) -> None:
     print(header)
 
     for row in range(8):
-        row_cells = []
-        for col in range(8):
-            pos = row * 8 + col
-            mask = 1 << pos
-            if board_state.black & mask:
-                cell = "○"
-            elif board_state.white & mask:
-                cell = "●"
-            else:
-                cell = "·"
-            row_cells.append(cell)
+        black_row = (board_state.black >> (row * 8)) & 0xFF
+        white_row = (board_state.white >> (row * 8)) & 0xFF
+        row_cells = " ".join(
+            GLYPHS[((black_row >> col) & 1) | (((white_row >> col) & 1) << 1)]
+            for col in range(8)
+        )
 
         row_number = str(row + 1)
-        print(f"{row_number} " + " ".join(row_cells) + f" {row_number}")
+        print(f"{row_number} {row_cells} {row_number}")
 
     print(header)
@@ -11,7 +11,7 @@ def main():
     user_name = input("Enter your name: ").strip()
     
     # Initialize game - player is black, computer is white
-    board_state = BoardState(user=user_name)
+    board_state = BoardState.new_game(user_name)
     consecutive_passes = 0
     
     print(f"\n{user_name}, you are playing as Black (●)")
@@ -40,7 +40,7 @@ def main():
             move = choose_move(board_state)
             move_notation = _position_to_notation(move)
             print(f"Computer plays {move_notation}")
-            board_state = make_move(move, board_state)
+            board_state = make_move(move, board_state, legal_moves)
             # display_board(board_state)
             print()
         else:
@@ -60,7 +60,7 @@ def main():
                 except ValueError:
                     print(f"Invalid format. Please use format like 'd3'. Valid moves: {_format_legal_moves(legal_moves)}")
             
-            board_state = make_move(move, board_state)
+            board_state = make_move(move, board_state, legal_moves)
             print()
     
     # Game over - count pieces
@@ -68,8 +68,8 @@ def main():
     print("\nFinal board:")
     display_board(board_state)
     
-    black_count = bin(board_state.black).count('1')
-    white_count = bin(board_state.white).count('1')
+    black_count = board_state.black.bit_count()
+    white_count = board_state.white.bit_count()
     
     print(f"\nBlack (You): {black_count}")
     print(f"White (Computer): {white_count}")
@@ -3,17 +3,27 @@ import random
 from typing import List, Optional
 
 from board_state import BoardState, Player
+from core_nb import simulate_batch_nb
 from legal_moves import get_legal_moves
-from make_move import make_move
+from make_move import _apply_move_unchecked, make_move
 
 
-def choose_move(board_state: BoardState, explorations: int = 10000) -> int | None:
+# Random playouts run from each newly expanded leaf. Running them as one
+# batch lets the compiled simulation spread them across CPU cores.
+PLAYOUTS_PER_LEAF = 16
+
+SEED_MASK = (1 << 64) - 1
+
+
+def choose_move(board_state: BoardState, explorations: int = 10000,
+                playouts_per_leaf: int = PLAYOUTS_PER_LEAF) -> int | None:
     """
     Choose a move using Monte Carlo Tree Search (MCTS).
 
     Args:
         board_state: Current board state
-        explorations: Number of MCTS iterations (default: 1000)
+        explorations: Total number of random playouts (default: 10000)
+        playouts_per_leaf: Playouts run as one batch from each expanded leaf
 
     Returns:
         The chosen move (0-63), or None if no legal moves exist
@@ -24,8 +34,11 @@ def choose_move(board_state: BoardState, explorations: int = 10000) -> int | Non
 
     root = _Node(board_state=board_state, parent=None, move=None)
     root_player = board_state.next_player
+    # Playout i of the search uses seed base_seed + i, so the whole search
+    # needs only one draw from Python's random module
+    base_seed = random.getrandbits(64)
 
-    for _ in range(explorations):
+    for iteration in range(max(1, explorations // playouts_per_leaf)):
         node = root
 
         # Selection
@@ -37,10 +50,11 @@ def choose_move(board_state: BoardState, explorations: int = 10000) -> int | Non
             node = node.expand()
 
         # Simulation
-        result = _simulate(node.board_state, root_player)
+        seed = (base_seed + iteration * playouts_per_leaf) & SEED_MASK
+        result = _simulate(node.board_state, root_player, seed, playouts_per_leaf)
 
         # Backpropagation
-        node.backpropagate(result)
+        node.backpropagate(result, playouts_per_leaf)
 
     # Choose the most visited child
     best_child = max(root.children, key=lambda c: c.visits, default=None)
@@ -65,30 +79,35 @@ class _Node:
 
     def expand(self) -> '_Node':
         move = self.untried_moves.pop()
-        new_state = make_move(move, self.board_state)
+        if move is None:
+            new_state = make_move(None, self.board_state)
+        else:
+            new_state = _apply_move_unchecked(move, self.board_state)
         child = _Node(new_state, parent=self, move=move)
         self.children.append(child)
         return child
 
     def best_child(self, c: float = 1.4) -> '_Node':
         # UCT: value/visits + c * sqrt(log(parent.visits) / visits)
+        # The parent term is the same for every child, so compute it once
+        explore_coeff = c * math.sqrt(math.log(self.visits))
         best_score = float('-inf')
         best = None
         for child in self.children:
             if child.visits == 0:
                 return child
             exploit = child.value / child.visits
-            explore = c * math.sqrt(math.log(self.visits) / child.visits)
+            explore = explore_coeff / math.sqrt(child.visits)
             score = exploit + explore
             if score > best_score:
                 best_score = score
                 best = child
         return best
 
-    def backpropagate(self, result: float) -> None:
+    def backpropagate(self, result: float, playouts: int = 1) -> None:
         node = self
         while node is not None:
-            node.visits += 1
+            node.visits += playouts
             node.value += result
             node = node.parent
 
@@ -100,30 +119,16 @@ def _get_moves_including_pass(board_state: BoardState) -> List[Optional[int]]:
     return [None]
 
 
-def _simulate(board_state: BoardState, root_player: Player) -> float:
-    """Play random moves until game ends. Return result from root player's perspective."""
-    state = board_state
-    consecutive_passes = 0
-
-    while consecutive_passes < 2:
-        moves = get_legal_moves(state)
-        if not moves:
-            state = make_move(None, state)
-            consecutive_passes += 1
-            continue
-
-        consecutive_passes = 0
-        move = random.choice(moves)
-        state = make_move(move, state)
-
-    black_count = bin(state.black).count('1')
-    white_count = bin(state.white).count('1')
-
-    if black_count == white_count:
-        return 0.0
+def _simulate(board_state: BoardState, root_player: Player, seed: int, playouts: int = 1) -> float:
+    """
+    Play random games until they end. Return the summed result from root player's perspective.
 
-    winner = Player.BLACK if black_count > white_count else Player.WHITE
-    return 1.0 if winner == root_player else -1.0
+    Each playout scores 1 for a root player win, -1 for a loss and 0 for a draw.
+    Playout i is seeded with seed + i.
+    """
+    player_pieces, opponent_pieces = board_state.pieces()
+    total = simulate_batch_nb(player_pieces, opponent_pieces, playouts, seed)
+    return float(total if board_state.next_player is root_player else -total)
 
 
 def _is_game_over(board_state: BoardState) -> bool:
@@ -1,8 +1,10 @@
 import random
 
-from board_state import BoardState, Player
-from legal_moves import get_legal_moves
-from make_move import make_move
+from board_state import BoardState
+from core_nb import (
+    CORNER_ADJACENT, CORNERS, EDGES, INF, WIN_SCORE, apply_move_nb, evaluate_nb, legal_mask_nb,
+)
+from legal_moves import bits
 
 
 # Default evaluation weights
@@ -14,6 +16,32 @@ DEFAULT_WEIGHTS = {
     'piece_count': 2.21,
 }
 
+# Order of the weights tuple passed to the search kernels
+WEIGHT_KEYS = ('mobility', 'corners', 'corner_adjacent', 'edges', 'piece_count')
+
+# Transposition table entry flags: the stored score is exact, or only a
+# lower/upper bound because the search was cut off by alpha-beta
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def _move_order_scores() -> tuple[int, ...]:
+    scores = [0] * 64
+    for edge in EDGES:
+        scores[edge] = 10
+    for adjacent in CORNER_ADJACENT:
+        for square in adjacent:
+            scores[square] = -50
+    for corner in CORNERS:
+        scores[corner] = 1000
+    return tuple(scores)
+
+
+# Static move ordering: corners first, then edges, with the X/C-squares next
+# to corners last. Searching likely-good moves first gives more beta cutoffs.
+MOVE_ORDER_SCORE = _move_order_scores()
+
 
 def choose_move(board_state: BoardState, depth: int = 6, weights: dict | None = None) -> int | None:
     """
@@ -29,90 +57,174 @@ def choose_move(board_state: BoardState, depth: int = 6, weights: dict | None =
     """
     if weights is None:
         weights = DEFAULT_WEIGHTS
-    
-    legal_moves = get_legal_moves(board_state)
-    if not legal_moves:
+    weight_values = _weight_tuple(weights)
+    # Transposition table, keyed by (player_pieces, opponent_pieces). It only
+    # lives for this search because scores depend on the weights.
+    table = {}
+
+    player_pieces, opponent_pieces = board_state.pieces()
+    moves = legal_mask_nb(player_pieces, opponent_pieces)
+    if not moves:
         return None
+    # Every move adds exactly one piece, so the search tracks the count
+    # instead of recounting it at each leaf
+    total_pieces = (player_pieces | opponent_pieces).bit_count()
     
-    best_moves = []
-    best_score = float('-inf')
-    alpha = float('-inf')
-    beta = float('inf')
-    
-    for move in legal_moves:
-        new_board = make_move(move, board_state)
-        # Negamax returns score from current player's perspective
-        # We negate it since we're evaluating opponent's position
-        score = -negamax(new_board, depth - 1, -beta, -alpha, weights)
-        
-        if score > best_score:
-            best_score = score
-            best_moves = [move]
-            alpha = max(alpha, score)
-        elif score == best_score:
-            best_moves.append(move)
+    # Iterative deepening: each pass searches the previous pass's best move
+    # first, and leaves best moves in the table to order the deeper nodes
+    previous_best = None
+    for iteration_depth in range(1, max(depth, 1) + 1):
+        best_move = None
+        ties = 0
+        best_score = -INF
+        alpha = -INF
+        beta = INF
+
+        for move in _ordered_moves(moves, previous_best):
+            new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+            # Negamax returns score from current player's perspective
+            # We negate it since we're evaluating opponent's position
+            score = -negamax(new_opponent, new_player, iteration_depth - 1, -beta, -alpha,
+                             weight_values, table, total_pieces + 1)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                ties = 1
+                alpha = max(alpha, score)
+            elif score == best_score:
+                # Searched with alpha already at best_score, this is only an
+                # upper bound and the move may really be worse. Confirm with
+                # a full window before treating it as a tie.
+                score = -negamax(new_opponent, new_player, iteration_depth - 1, -INF, INF,
+                                 weight_values, table, total_pieces + 1)
+                if score < best_score:
+                    continue
+                # Reservoir sampling: each tied move ends up chosen with equal probability
+                ties += 1
+                if random.random() * ties < 1:
+                    best_move = move
+
+        previous_best = best_move
     
-    return random.choice(best_moves)
+    return best_move
 
 
-def negamax(board_state: BoardState, depth: int, alpha: float, beta: float, weights: dict) -> float:
+def negamax(player_pieces: int, opponent_pieces: int, depth: int, alpha: float, beta: float,
+            weights: tuple, table: dict, total_pieces: int) -> float:
     """
-    Negamax algorithm with alpha-beta pruning.
+    Negamax algorithm with alpha-beta pruning and a transposition table.
+
+    Works directly on bitboards: the side to move owns player_pieces, and
+    each ply swaps the two bitmaps instead of building a BoardState. The
+    bitmap pair is also the transposition key, so positions reached through
+    different move orders are searched only once per depth.
     
     Args:
-        board_state: Current board state
+        player_pieces: Bitmap of the side to move
+        opponent_pieces: Bitmap of the other side
         depth: Remaining search depth
         alpha: Alpha value for pruning
         beta: Beta value for pruning
-        weights: Dictionary of evaluation weights
+        weights: Tuple of evaluation weights in WEIGHT_KEYS order
+        table: Transposition table mapping bitmap pairs to (depth, score, flag, best_move)
+        total_pieces: Number of pieces on the board (player and opponent)
     
     Returns:
         Score from current player's perspective
     """
-    legal_moves = get_legal_moves(board_state)
-    
+    # Every real move fills a square, so once the empty squares fit in the
+    # remaining depth the game can be searched to the end with exact scores
+    if 64 - total_pieces <= depth:
+        return _solve(player_pieces, opponent_pieces, alpha, beta)
+
     # Terminal conditions
     if depth == 0:
-        return evaluate(board_state, weights)
+        return evaluate_nb(player_pieces, opponent_pieces, total_pieces, weights)
+
+    key = (player_pieces, opponent_pieces)
+    entry = table.get(key)
+    best_move = None
+    if entry is not None:
+        entry_depth, score, flag, best_move = entry
+        if entry_depth >= depth:
+            if flag == EXACT:
+                return score
+            if flag == LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+    original_alpha = alpha
+
+    moves = legal_mask_nb(player_pieces, opponent_pieces)
     
     # Check for game over (no moves for either player)
-    if not legal_moves:
-        # Pass to opponent
-        new_board = make_move(None, board_state)
-        opponent_moves = get_legal_moves(new_board)
-        
-        if not opponent_moves:
+    if not moves:
+        if not legal_mask_nb(opponent_pieces, player_pieces):
             # Game over - evaluate final position
-            return evaluate_final(board_state)
-        else:
-            # Opponent can move after pass
-            return -negamax(new_board, depth, -beta, -alpha, weights)
+            return _evaluate_final(player_pieces, opponent_pieces)
+        # Opponent can move after pass
+        return -negamax(opponent_pieces, player_pieces, depth, -beta, -alpha, weights, table, total_pieces)
     
-    max_score = float('-inf')
+    max_score = -INF
     
-    for move in legal_moves:
-        new_board = make_move(move, board_state)
-        score = -negamax(new_board, depth - 1, -beta, -alpha, weights)
+    for move in _ordered_moves(moves, best_move):
+        new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+        score = -negamax(new_opponent, new_player, depth - 1, -beta, -alpha, weights, table, total_pieces + 1)
         
-        max_score = max(max_score, score)
+        if score > max_score:
+            max_score = score
+            best_move = move
         alpha = max(alpha, score)
         
         if alpha >= beta:
             break  # Beta cutoff
+
+    if max_score <= original_alpha:
+        flag = UPPER_BOUND
+    elif max_score >= beta:
+        flag = LOWER_BOUND
+    else:
+        flag = EXACT
+    table[key] = (depth, max_score, flag, best_move)
     
     return max_score
 
 
+def _solve(player_pieces: int, opponent_pieces: int, alpha: float, beta: float) -> float:
+    """
+    Search to the end of the game, scoring only final positions.
+
+    Passes do not count against any depth, so this always reaches the end
+    of the game. Final scores are win/draw/loss, so a win is as good as it
+    gets: capping beta there cuts off the remaining moves once one is found.
+    """
+    moves = legal_mask_nb(player_pieces, opponent_pieces)
+    if not moves:
+        if not legal_mask_nb(opponent_pieces, player_pieces):
+            return _evaluate_final(player_pieces, opponent_pieces)
+        return -_solve(opponent_pieces, player_pieces, -beta, -alpha)
+
+    beta = min(beta, WIN_SCORE)
+    max_score = -INF
+    for move in _ordered_moves(moves, None):
+        new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+        score = -_solve(new_opponent, new_player, -beta, -alpha)
+        if score > max_score:
+            max_score = score
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+    return max_score
+
+
 def evaluate(board_state: BoardState, weights: dict) -> float:
     """
     Evaluate a board position from the current player's perspective.
     
-    Uses a combination of factors:
-    - Mobility (number of legal moves)
-    - Corner control (very valuable)
-    - Dangerous squares adjacent to empty corners (heavily penalized)
-    - Edge control
-    - Piece count (weighted less early in game)
+    See core_nb.evaluate_nb for the factors considered.
     
     Args:
         board_state: Board state to evaluate
@@ -121,68 +233,9 @@ def evaluate(board_state: BoardState, weights: dict) -> float:
     Returns:
         Score from current player's perspective (positive is better)
     """
-    if board_state.next_player == Player.BLACK:
-        player_pieces = board_state.black
-        opponent_pieces = board_state.white
-    else:
-        player_pieces = board_state.white
-        opponent_pieces = board_state.black
-    
-    score = 0.0
-    
-    # Mobility - number of legal moves
-    player_mobility = len(get_legal_moves(board_state))
-    # Create temporary board with opponent as next player
-    temp_board = BoardState(
-        user=board_state.user,
-        black=board_state.black,
-        white=board_state.white,
-        next_player=Player.WHITE if board_state.next_player == Player.BLACK else Player.BLACK,
-        session_id=board_state.session_id
-    )
-    opponent_mobility = len(get_legal_moves(temp_board))
-    
-    if player_mobility + opponent_mobility != 0:
-        score += weights['mobility'] * (player_mobility - opponent_mobility)
-    
-    # Corner control (corners are extremely valuable)
-    corners = [0, 7, 56, 63]
-    player_corners = sum(1 for c in corners if player_pieces & (1 << c))
-    opponent_corners = sum(1 for c in corners if opponent_pieces & (1 << c))
-    score += weights['corners'] * (player_corners - opponent_corners)
-    
-    # Dangerous squares adjacent to corners (X-squares and C-squares)
-    # Only penalize if the corner is empty
-    corner_adjacent = {
-        0: [1, 8, 9],      # Top-left corner
-        7: [6, 14, 15],    # Top-right corner
-        56: [48, 49, 57],  # Bottom-left corner
-        63: [54, 55, 62]   # Bottom-right corner
-    }
-    
-    for corner, adjacent in corner_adjacent.items():
-        corner_occupied = (player_pieces | opponent_pieces) & (1 << corner)
-        if not corner_occupied:  # Corner is empty
-            for adj in adjacent:
-                if player_pieces & (1 << adj):
-                    score -= weights['corner_adjacent']  # Heavy penalty for occupying square next to empty corner
-                if opponent_pieces & (1 << adj):
-                    score += weights['corner_adjacent']  # Bonus if opponent made this mistake
-    
-    # Edge control (edges are valuable if you control the corner or it's occupied)
-    edges = [1, 2, 3, 4, 5, 6, 8, 16, 24, 32, 40, 48, 15, 23, 31, 39, 47, 55, 57, 58, 59, 60, 61, 62]
-    player_edges = sum(1 for e in edges if player_pieces & (1 << e))
-    opponent_edges = sum(1 for e in edges if opponent_pieces & (1 << e))
-    score += weights['edges'] * (player_edges - opponent_edges)
-    
-    # Piece count (matters more in endgame)
-    total_pieces = bin(player_pieces | opponent_pieces).count('1')
-    piece_weight = total_pieces / 64.0  # Increases as game progresses
-    player_count = bin(player_pieces).count('1')
-    opponent_count = bin(opponent_pieces).count('1')
-    score += piece_weight * weights['piece_count'] * (player_count - opponent_count)
-    
-    return score
+    player_pieces, opponent_pieces = board_state.pieces()
+    total_pieces = (player_pieces | opponent_pieces).bit_count()
+    return evaluate_nb(player_pieces, opponent_pieces, total_pieces, _weight_tuple(weights))
 
 
 def evaluate_final(board_state: BoardState) -> float:
@@ -195,19 +248,29 @@ def evaluate_final(board_state: BoardState) -> float:
     Returns:
         Large positive score if current player wins, large negative if loses, 0 for draw
     """
-    if board_state.next_player == Player.BLACK:
-        player_pieces = board_state.black
-        opponent_pieces = board_state.white
-    else:
-        player_pieces = board_state.white
-        opponent_pieces = board_state.black
-    
-    player_count = bin(player_pieces).count('1')
-    opponent_count = bin(opponent_pieces).count('1')
+    return _evaluate_final(*board_state.pieces())
+
+
+def _evaluate_final(player_pieces: int, opponent_pieces: int) -> float:
+    player_count = player_pieces.bit_count()
+    opponent_count = opponent_pieces.bit_count()
     
     if player_count > opponent_count:
-        return 1000.0
+        return WIN_SCORE
     elif player_count < opponent_count:
-        return -1000.0
+        return -WIN_SCORE
     else:
         return 0.0
+
+
+def _ordered_moves(moves: int, best_move: int | None) -> list[int]:
+    """Order legal moves for search, trying a known best move first."""
+    ordered = sorted(bits(moves), key=MOVE_ORDER_SCORE.__getitem__, reverse=True)
+    if best_move is not None and best_move != ordered[0]:
+        ordered.remove(best_move)
+        ordered.insert(0, best_move)
+    return ordered
+
+
+def _weight_tuple(weights: dict) -> tuple[float, float, float, float, float]:
+    return tuple(float(weights[key]) for key in WEIGHT_KEYS)
@@ -1,8 +1,8 @@
 import random
 
 from board_state import BoardState
-from legal_moves import get_legal_moves
-from make_move import make_move
+from core_nb import apply_move_nb, legal_mask_nb, popcount
+from legal_moves import bits
 
 
 def choose_move(board_state: BoardState) -> int | None:
@@ -20,25 +20,30 @@ def choose_move(board_state: BoardState) -> int | None:
     Returns:
         The chosen move (0-63), or None if no legal moves exist
     """
-    legal_moves = get_legal_moves(board_state)
+    player_pieces, opponent_pieces = board_state.pieces()
+    legal_moves = legal_mask_nb(player_pieces, opponent_pieces)
     if not legal_moves:
         return None
 
-    best_moves = []
+    best_move = None
+    ties = 0
     min_opponent_moves = float('inf')
 
-    for move in legal_moves:
+    for move in bits(legal_moves):
         # Apply the move and see how many moves the opponent would have
-        new_board = make_move(move, board_state)
-        opponent_moves = get_legal_moves(new_board)
-        opponent_count = len(opponent_moves)
+        new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+        opponent_count = popcount(legal_mask_nb(new_opponent, new_player))
 
         if opponent_count < min_opponent_moves:
-            # Found a better move - reset the list
+            # Found a better move - restart the tie count
             min_opponent_moves = opponent_count
-            best_moves = [move]
+            best_move = move
+            ties = 1
         elif opponent_count == min_opponent_moves:
-            # Tied with the best - add to list
-            best_moves.append(move)
+            # Tied with the best - keep it with probability 1/ties so that
+            # every tied move is equally likely to be chosen
+            ties += 1
+            if random.random() * ties < 1:
+                best_move = move
 
-    return random.choice(best_moves)
+    return best_move
@@ -19,7 +19,16 @@ class TestBoardState(unittest.TestCase):
         self.assertEqual(board.black, BoardState.DEFAULT_BLACK)
         self.assertEqual(board.white, BoardState.DEFAULT_WHITE)
         self.assertEqual(board.next_player, Player.BLACK)
-        self.assertIsNotNone(board.session_id)
+        self.assertIsNone(board.session_id)
+
+    def test_new_game(self):
+        """Test that new_game creates the starting position with a session UUID."""
+        board = BoardState.new_game("testuser")
+
+        self.assertEqual(board.user, "testuser")
+        self.assertEqual(board.black, BoardState.DEFAULT_BLACK)
+        self.assertEqual(board.white, BoardState.DEFAULT_WHITE)
+        self.assertEqual(board.next_player, Player.BLACK)
         # Verify it's a valid UUID format
         uuid.UUID(board.session_id)
     
@@ -61,12 +70,26 @@ class TestBoardState(unittest.TestCase):
         self.assertEqual(board.next_player, Player.BLACK)
     
     def test_session_id_uniqueness(self):
-        """Test that each BoardState gets a unique session_id by default."""
-        board1 = BoardState(user="user1")
-        board2 = BoardState(user="user2")
+        """Test that each new game gets a unique session_id."""
+        board1 = BoardState.new_game("user1")
+        board2 = BoardState.new_game("user2")
         
         self.assertNotEqual(board1.session_id, board2.session_id)
     
+    def test_immutable(self):
+        """Test that a BoardState cannot be modified in place."""
+        board = BoardState(user="testuser")
+        with self.assertRaises(AttributeError):
+            board.black = 0
+
+    def test_pieces_for_side_to_move(self):
+        """Test that pieces() returns the side to move's bitmap first."""
+        black_to_move = BoardState(user="testuser", black=0xFF, white=0xF0)
+        white_to_move = black_to_move._replace(next_player=Player.WHITE)
+
+        self.assertEqual(black_to_move.pieces(), (0xFF, 0xF0))
+        self.assertEqual(white_to_move.pieces(), (0xF0, 0xFF))
+
     def test_player_enum_values(self):
         """Test Player enum has correct values."""
         self.assertEqual(Player.BLACK.value, "black")
@@ -0,0 +1,129 @@
+import unittest
+import sys
+from pathlib import Path
+import random
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from board_state import BoardState
+from core_nb import (
+    _build_flip_rays, apply_move_nb, evaluate_nb, flips_nb, legal_mask_nb, negamax_nb,
+    play_game_nb, popcount,
+)
+from legal_moves import bits
+from strategy_negamax import negamax
+
+
+def _reference_flips(position: int, player_pieces: int, opponent_pieces: int) -> int:
+    """Walk each of the 8 rays square by square, like the original make_move."""
+    row, col = divmod(position, 8)
+    flips = 0
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr == 0 and dc == 0:
+                continue
+            r, c = row + dr, col + dc
+            run = 0
+            while 0 <= r < 8 and 0 <= c < 8 and opponent_pieces & (1 << (r * 8 + c)):
+                run |= 1 << (r * 8 + c)
+                r += dr
+                c += dc
+            if run and 0 <= r < 8 and 0 <= c < 8 and player_pieces & (1 << (r * 8 + c)):
+                flips |= run
+    return flips
+
+
+class TestCoreNb(unittest.TestCase):
+
+    def test_popcount(self):
+        """popcount should count set bits across the full 64-bit range."""
+        self.assertEqual(popcount(0), 0)
+        self.assertEqual(popcount(1 << 63), 1)
+        self.assertEqual(popcount((1 << 64) - 1), 64)
+        self.assertEqual(popcount(BoardState.DEFAULT_BLACK), 2)
+
+    def test_legal_mask_starting_position(self):
+        """Black's legal moves from the start are d3, c4, f5 and e6."""
+        mask = legal_mask_nb(BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE)
+        self.assertEqual(mask, (1 << 19) | (1 << 26) | (1 << 37) | (1 << 44))
+
+    def test_flips_on_high_squares(self):
+        """Flips should work for moves that touch the top bit of the board."""
+        # Player at 61 (f8), opponent at 62 (g8), move at 63 (h8)
+        self.assertEqual(flips_nb(63, 1 << 61, 1 << 62), 1 << 62)
+
+    def test_flip_tables_match_flips(self):
+        """The flip tables and flips_nb should both agree with a plain ray walk."""
+        flip_rays = _build_flip_rays()
+        rng = random.Random(0)
+        for _ in range(200):
+            player = rng.getrandbits(64) & rng.getrandbits(64)
+            opponent = rng.getrandbits(64) & ~player
+            for move in bits(legal_mask_nb(player, opponent)):
+                flips = 0
+                for ray_mask, table in flip_rays[move]:
+                    run, stop = table[opponent & ray_mask]
+                    if player & stop:
+                        flips |= run
+                expected = _reference_flips(move, player, opponent)
+                self.assertEqual(flips, expected)
+                self.assertEqual(flips_nb(move, player, opponent), expected)
+
+    def test_legal_mask_stays_within_64_bits(self):
+        """Moves onto the top square are found and nothing spills past bit 63."""
+        # Player at 61 (f8), opponent at 62 (g8): h8 (63) is legal
+        mask = legal_mask_nb(1 << 61, 1 << 62)
+        self.assertEqual(mask, 1 << 63)
+
+        # A full row of opponent pieces on the bottom rank must not wrap
+        mask = legal_mask_nb(1 << 55, 0xFF << 56)
+        self.assertEqual(mask >> 64, 0)
+
+    def test_apply_move(self):
+        """apply_move_nb should place the piece and transfer flipped pieces."""
+        player, opponent = apply_move_nb(BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE, 19)
+
+        self.assertEqual(player, BoardState.DEFAULT_BLACK | (1 << 19) | (1 << 27))
+        self.assertEqual(opponent, BoardState.DEFAULT_WHITE & ~(1 << 27))
+
+    def test_evaluate_is_zero_sum(self):
+        """Swapping sides should negate the evaluation."""
+        weights = (17.16, 125.73, 43.71, 6.23, 2.21)
+        player, opponent = apply_move_nb(BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE, 19)
+
+        score = evaluate_nb(player, opponent, 5, weights)
+        self.assertAlmostEqual(score, -evaluate_nb(opponent, player, 5, weights))
+
+    def test_negamax_matches_search(self):
+        """The compiled search should score positions like strategy_negamax, endgames included."""
+        weights = (17.16, 125.73, 43.71, 6.23, 2.21)
+        rng = random.Random(7)
+        for plies in (8, 20, 58):
+            player, opponent = BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE
+            for _ in range(plies):
+                moves = list(bits(legal_mask_nb(player, opponent)))
+                if moves:
+                    player, opponent = apply_move_nb(player, opponent, rng.choice(moves))
+                player, opponent = opponent, player
+
+            total = popcount(player | opponent)
+            expected = negamax(player, opponent, 3, float('-inf'), float('inf'), weights, {}, total)
+            actual = negamax_nb(player, opponent, 3, float('-inf'), float('inf'), total, weights)
+            self.assertAlmostEqual(actual, expected)
+
+    def test_play_game(self):
+        """play_game_nb should report the winner from black's side and repeat for a seed."""
+        weights = (17.16, 125.73, 43.71, 6.23, 2.21)
+        full = (1 << 64) - 1
+        self.assertEqual(play_game_nb(full, 0, weights, weights, 2, 1), 1)
+        self.assertEqual(play_game_nb(0, full, weights, weights, 2, 1), -1)
+
+        start = (BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE, weights, weights, 2)
+        result = play_game_nb(*start, 42)
+        self.assertIn(result, (-1, 0, 1))
+        self.assertEqual(play_game_nb(*start, 42), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from board_state import BoardState, Player
-from legal_moves import get_legal_moves
+from legal_moves import bits, get_legal_moves, legal_move_mask
 
 
 class TestLegalMoves(unittest.TestCase):
@@ -200,6 +200,36 @@ class TestLegalMoves(unittest.TestCase):
         legal_moves = get_legal_moves(board)
         self.assertIn(2, legal_moves, "East direction should work")
     
+    def test_no_wraparound_between_rows(self):
+        """Test that rays do not wrap from one edge of the board to the other."""
+        # Black at position 6 (g1), white at position 7 (h1)
+        # Position 8 (a2) is "next" in bit order but not on the same row
+        board = BoardState(
+            user="testuser",
+            black=(1 << 6),
+            white=(1 << 7),
+            next_player=Player.BLACK
+        )
+        legal_moves = get_legal_moves(board)
+
+        self.assertNotIn(8, legal_moves)
+        self.assertEqual(len(legal_moves), 0)
+
+    def test_legal_move_mask_matches_list(self):
+        """Test that the legal move bitmap has exactly the listed moves set."""
+        board = BoardState(user="testuser")
+        mask = legal_move_mask(board.black, board.white)
+
+        expected_mask = 0
+        for move in get_legal_moves(board):
+            expected_mask |= 1 << move
+        self.assertEqual(mask, expected_mask)
+
+    def test_bits_yields_set_positions_in_order(self):
+        """Test that bits() yields each set bit position, lowest first."""
+        self.assertEqual(list(bits(0)), [])
+        self.assertEqual(list(bits((1 << 63) | (1 << 9) | 1)), [0, 9, 63])
+
     def test_empty_board(self):
         """Test that an empty board has no legal moves."""
         board = BoardState(
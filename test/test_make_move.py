@@ -6,7 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from board_state import BoardState, Player
-from make_move import make_move
+from make_move import _apply_move_unchecked, make_move
 from legal_moves import get_legal_moves
 
 
@@ -14,7 +14,7 @@ class TestMakeMove(unittest.TestCase):
 
     def test_pass_move_toggles_player(self):
         """Passing (move=None) should toggle the next player without changing pieces."""
-        board = BoardState(user="testuser")
+        board = BoardState.new_game("testuser")
         new_board = make_move(None, board)
 
         self.assertEqual(new_board.black, board.black)
@@ -29,6 +29,15 @@ class TestMakeMove(unittest.TestCase):
         with self.assertRaises(ValueError):
             make_move(0, board)  # corner is illegal from starting position
 
+    def test_move_checked_against_given_legal_moves(self):
+        """A supplied legal move list should be used for validation."""
+        board = BoardState(user="testuser")
+        legal_moves = get_legal_moves(board)
+        new_board = make_move(19, board, legal_moves)
+        self.assertEqual(new_board, make_move(19, board))
+        with self.assertRaises(ValueError):
+            make_move(0, board, legal_moves)
+
     def test_out_of_bounds_raises(self):
         """Out of bounds move should raise ValueError."""
         board = BoardState(user="testuser")
@@ -84,9 +93,34 @@ class TestMakeMove(unittest.TestCase):
         # Next player should be black
         self.assertEqual(new_board.next_player, Player.BLACK)
 
+    def test_move_flips_in_multiple_directions(self):
+        """A move should flip every sandwiched line, not just the first one found."""
+        # Move at 18 (c3) sandwiches white 10 (c2) against black 2 (c1)
+        # and white 17 (b3) against black 16 (a3)
+        board = BoardState(
+            user="testuser",
+            black=(1 << 2) | (1 << 16),
+            white=(1 << 10) | (1 << 17),
+        )
+        new_board = make_move(18, board)
+
+        self.assertEqual(new_board.black, (1 << 2) | (1 << 16) | (1 << 10) | (1 << 17) | (1 << 18))
+        self.assertEqual(new_board.white, 0)
+
+    def test_unchecked_move_matches_make_move(self):
+        """_apply_move_unchecked should produce the same state as make_move for legal moves."""
+        board = BoardState(user="testuser", next_player=Player.WHITE)
+        for move in get_legal_moves(board):
+            unchecked = _apply_move_unchecked(move, board)
+            checked = make_move(move, board)
+
+            self.assertEqual(unchecked.black, checked.black)
+            self.assertEqual(unchecked.white, checked.white)
+            self.assertEqual(unchecked.next_player, checked.next_player)
+
     def test_session_id_preserved(self):
         """Session ID should be preserved across moves."""
-        board = BoardState(user="testuser")
+        board = BoardState.new_game("testuser")
         move = get_legal_moves(board)[0]
         new_board = make_move(move, board)
 
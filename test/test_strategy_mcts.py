@@ -0,0 +1,52 @@
+import unittest
+import sys
+from pathlib import Path
+import random
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from board_state import BoardState, Player
+from core_nb import playout_nb, simulate_batch_nb
+from legal_moves import get_legal_moves
+from strategy_mcts import choose_move
+
+
+class TestStrategyMcts(unittest.TestCase):
+
+    def test_returns_none_when_no_moves(self):
+        """Should return None if there are no legal moves."""
+        board = BoardState(user="testuser", black=0, white=0)
+        self.assertIsNone(choose_move(board, explorations=32))
+
+    def test_returns_legal_move(self):
+        """Should return a move that is legal for the current player."""
+        board = BoardState(user="testuser", next_player=Player.WHITE)
+        move = choose_move(board, explorations=256)
+        self.assertIn(move, get_legal_moves(board))
+
+    def test_deterministic_with_seed(self):
+        """With a fixed seed, the chosen move should be reproducible."""
+        board = BoardState(user="testuser")
+
+        random.seed(12345)
+        move1 = choose_move(board, explorations=256)
+
+        random.seed(12345)
+        move2 = choose_move(board, explorations=256)
+
+        self.assertEqual(move1, move2)
+
+    def test_playout_of_finished_game(self):
+        """A playout from a finished game should just score the final position."""
+        # Board full: side to move has 40 pieces, the other side 24
+        player_pieces = (1 << 40) - 1
+        opponent_pieces = ((1 << 64) - 1) ^ player_pieces
+
+        self.assertEqual(playout_nb(player_pieces, opponent_pieces, 1), 1)
+        self.assertEqual(playout_nb(opponent_pieces, player_pieces, 1), -1)
+        self.assertEqual(simulate_batch_nb(player_pieces, opponent_pieces, 10, 1), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
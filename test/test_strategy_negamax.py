@@ -0,0 +1,103 @@
+import unittest
+import sys
+from pathlib import Path
+import random
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from board_state import BoardState, Player
+from core_nb import apply_move_nb, evaluate_nb, legal_mask_nb, popcount
+from legal_moves import bits, get_legal_moves
+from make_move import make_move
+from strategy_negamax import DEFAULT_WEIGHTS, choose_move, negamax, _evaluate_final, _weight_tuple
+
+
+def _minimax(player_pieces, opponent_pieces, depth, weights):
+    """Reference search without pruning or transposition table."""
+    if depth == 0:
+        return evaluate_nb(player_pieces, opponent_pieces, popcount(player_pieces | opponent_pieces), weights)
+    moves = legal_mask_nb(player_pieces, opponent_pieces)
+    if not moves:
+        if not legal_mask_nb(opponent_pieces, player_pieces):
+            return _evaluate_final(player_pieces, opponent_pieces)
+        return -_minimax(opponent_pieces, player_pieces, depth, weights)
+    best = float('-inf')
+    for move in bits(moves):
+        new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+        best = max(best, -_minimax(new_opponent, new_player, depth - 1, weights))
+    return best
+
+
+def _random_position(seed: int, plies: int) -> BoardState:
+    rng = random.Random(seed)
+    board = BoardState(user="testuser")
+    for _ in range(plies):
+        legal_moves = get_legal_moves(board)
+        board = make_move(rng.choice(legal_moves) if legal_moves else None, board)
+    return board
+
+
+class TestStrategyNegamax(unittest.TestCase):
+
+    def test_returns_none_when_no_moves(self):
+        """Should return None if there are no legal moves."""
+        board = BoardState(user="testuser", black=0, white=0)
+        self.assertIsNone(choose_move(board, depth=2))
+
+    def test_returns_legal_move(self):
+        """Should return a move that is legal for the current player."""
+        board = BoardState(user="testuser", next_player=Player.WHITE)
+        move = choose_move(board, depth=3)
+        self.assertIn(move, get_legal_moves(board))
+
+    def test_search_matches_plain_minimax(self):
+        """Alpha-beta with the transposition table should not change the root value."""
+        weights = _weight_tuple(DEFAULT_WEIGHTS)
+        for seed in range(5):
+            board = _random_position(seed, plies=10 + seed)
+            player_pieces, opponent_pieces = board.pieces()
+
+            expected = _minimax(player_pieces, opponent_pieces, 3, weights)
+            total_pieces = popcount(player_pieces | opponent_pieces)
+            actual = negamax(player_pieces, opponent_pieces, 3, float('-inf'), float('inf'),
+                             weights, {}, total_pieces)
+            self.assertAlmostEqual(actual, expected)
+
+    def test_endgame_search_is_exact(self):
+        """Once the empty squares fit in the depth, the search should solve the game."""
+        weights = _weight_tuple(DEFAULT_WEIGHTS)
+        for seed in range(5):
+            board = _random_position(seed, plies=56)
+            player_pieces, opponent_pieces = board.pieces()
+            total_pieces = popcount(player_pieces | opponent_pieces)
+            if 64 - total_pieces > 6:
+                continue
+
+            expected = _minimax(player_pieces, opponent_pieces, 64, weights)
+            actual = negamax(player_pieces, opponent_pieces, 6, float('-inf'), float('inf'),
+                             weights, {}, total_pieces)
+            self.assertEqual(actual, expected)
+
+    def test_choose_move_wins_solved_endgames(self):
+        """In a solved endgame every chosen move, ties included, should keep the exact result."""
+        weights = _weight_tuple(DEFAULT_WEIGHTS)
+        random.seed(0)
+        for seed in range(40):
+            board = _random_position(seed, plies=54)
+            player_pieces, opponent_pieces = board.pieces()
+            moves = legal_mask_nb(player_pieces, opponent_pieces)
+            if not moves or 64 - popcount(player_pieces | opponent_pieces) > 6:
+                continue
+
+            results = {}
+            for move in bits(moves):
+                new_player, new_opponent = apply_move_nb(player_pieces, opponent_pieces, move)
+                results[move] = -_minimax(new_opponent, new_player, 64, weights)
+            for _ in range(5):
+                move = choose_move(board, depth=6)
+                self.assertEqual(results[move], max(results.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
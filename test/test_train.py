@@ -0,0 +1,90 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from train import ELO_K, _update_elo, play_rated_games
+
+
+class _StubExecutor:
+    """Executor that records the games it is given and returns fixed results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.games = []
+
+    def map(self, func, games):
+        self.games = list(games)
+        return iter(self.results[:len(self.games)])
+
+
+def _population(size: int) -> np.ndarray:
+    # Row i has every weight equal to i + 1, so games can be traced back to it
+    return np.repeat(np.arange(1.0, size + 1)[:, None], 5, axis=1)
+
+
+def _pairings(executor: _StubExecutor) -> list[tuple[int, int]]:
+    """(black, white) population indices of each game the executor was given."""
+    return [
+        (int(black['mobility']) - 1, int(white['mobility']) - 1)
+        for black, white in executor.games
+    ]
+
+
+class TestUpdateElo(unittest.TestCase):
+
+    def test_update_is_zero_sum(self):
+        """Rating points won by one side should be lost by the other."""
+        for result in (1, 0, -1):
+            new_black, new_white = _update_elo(1100.0, 950.0, result)
+            self.assertAlmostEqual(new_black + new_white, 1100.0 + 950.0)
+
+    def test_equal_ratings(self):
+        """Between equal ratings a win or loss moves each side by half of ELO_K."""
+        self.assertEqual(_update_elo(1000.0, 1000.0, 1), (1000.0 + ELO_K / 2, 1000.0 - ELO_K / 2))
+        self.assertEqual(_update_elo(1000.0, 1000.0, -1), (1000.0 - ELO_K / 2, 1000.0 + ELO_K / 2))
+        self.assertEqual(_update_elo(1000.0, 1000.0, 0), (1000.0, 1000.0))
+
+
+class TestPlayRatedGames(unittest.TestCase):
+
+    def test_neighbours_in_ranking_are_paired(self):
+        """The higher-rated side of each neighbouring pair plays black on even generations."""
+        elo = np.array([1000.0, 1030.0, 990.0, 1010.0])
+        executor = _StubExecutor([0, 0])
+        play_rated_games(_population(4), elo, executor, generation=0)
+        self.assertEqual(_pairings(executor), [(1, 3), (0, 2)])
+
+    def test_colours_swap_on_odd_generations(self):
+        """The higher-rated side of each pair plays white on odd generations."""
+        elo = np.array([1000.0, 1030.0, 990.0, 1010.0])
+        executor = _StubExecutor([0, 0])
+        play_rated_games(_population(4), elo, executor, generation=1)
+        self.assertEqual(_pairings(executor), [(3, 1), (2, 0)])
+
+    def test_lowest_rated_sits_out_odd_population(self):
+        """With an odd population the lowest-rated individual plays no game."""
+        elo = np.array([1000.0, 980.0, 1020.0])
+        executor = _StubExecutor([1])
+        play_rated_games(_population(3), elo, executor, generation=0)
+        self.assertEqual(_pairings(executor), [(2, 0)])
+        self.assertEqual(elo[1], 980.0)
+
+    def test_ratings_updated_in_place(self):
+        """Results should be applied to elo in place, from each game's colours."""
+        elo = np.full(4, 1000.0)
+        executor = _StubExecutor([1, -1])
+        play_rated_games(_population(4), elo, executor, generation=0)
+
+        # Equal ratings keep population order: 0 v 1, then 2 v 3
+        self.assertEqual(_pairings(executor), [(0, 1), (2, 3)])
+        half = ELO_K / 2
+        np.testing.assert_allclose(elo, [1000.0 + half, 1000.0 - half, 1000.0 - half, 1000.0 + half])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,18 @@
-import random
 import json
+import math
+import multiprocessing
+import os
 import signal
 import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Dict, List, Tuple
 
-from board_state import BoardState, Player
-from legal_moves import get_legal_moves
-from make_move import make_move
-from strategy_negamax import choose_move, DEFAULT_WEIGHTS
+import numpy as np
+
+from board_state import BoardState
+from core_nb import HAVE_NUMBA, legal_mask_nb, play_game_nb
+from make_move import _apply_move_unchecked, make_move
+from strategy_negamax import choose_move, DEFAULT_WEIGHTS, WEIGHT_KEYS, _weight_tuple
 
 
 # Training parameters
@@ -15,26 +20,60 @@ POPULATION_SIZE = 20
 GENERATIONS = 100
 MUTATION_RATE = 0.3
 MUTATION_SCALE = 0.2
-GAMES_PER_MATCHUP = 2  # Play each matchup twice (switching colors)
+SEARCH_DEPTH = 3
+VERBOSE = False  # Log every game's result, not just the generation summary
 BEST_WEIGHTS_FILE = "best_weights.txt"
 
+# Range of each weight, in WEIGHT_KEYS order, for random individuals
+WEIGHTS_LOW = np.array([5.0, 50.0, 20.0, 1.0, 0.5])
+WEIGHTS_HIGH = np.array([30.0, 150.0, 60.0, 10.0, 5.0])
+
 # Global variable to track best weights for signal handler
 best_weights = None
 best_fitness = float('-inf')
 
+# Every square occupied
+FULL_BOARD = (1 << 64) - 1
+
 # ELO parameters
 ELO_START = 1000.0
 ELO_K = 24.0
+# 10 ** (x / 400) == exp(x * _LN10_OVER_400)
+_LN10_OVER_400 = math.log(10) / 400
+
+
+# The population is a (POPULATION_SIZE, 5) array with one row of weights per
+# individual, columns in WEIGHT_KEYS order, plus a parallel array of ELO
+# ratings. Rows only become dicts where choose_move or state.json need them.
+
+def _weights_dict(row: np.ndarray, elo: float | None = None) -> Dict:
+    """Convert a population row to a weights dict, optionally with its ELO."""
+    weights = dict(zip(WEIGHT_KEYS, row.tolist()))
+    if elo is not None:
+        weights['elo'] = float(elo)
+    return weights
+
+
+def _population_dicts(population: np.ndarray, elo: np.ndarray) -> List[Dict]:
+    return [_weights_dict(row, rating) for row, rating in zip(population, elo)]
+
+
+def _population_arrays(population: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of _population_dicts, for restoring saved state."""
+    rows = np.array([[weights[key] for key in WEIGHT_KEYS] for weights in population])
+    elo = np.array([weights.get('elo', ELO_START) for weights in population])
+    return rows, elo
 
 
-def _compact_weights(weights: Dict) -> str:
+def _compact_weights(row: np.ndarray, elo: float) -> str:
+    mobility, corners, corner_adjacent, edges, piece_count = row.tolist()
     return (
-        f"m{weights['mobility']:.2f} "
-        f"c{weights['corners']:.2f} "
-        f"ca{weights['corner_adjacent']:.2f} "
-        f"e{weights['edges']:.2f} "
-        f"p{weights['piece_count']:.2f} "
-        f"elo{weights.get('elo', ELO_START):.0f}"
+        f"m{mobility:.2f} "
+        f"c{corners:.2f} "
+        f"ca{corner_adjacent:.2f} "
+        f"e{edges:.2f} "
+        f"p{piece_count:.2f} "
+        f"elo{elo:.0f}"
     )
 
 
@@ -68,97 +107,84 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
-def create_random_weights() -> Dict:
-    """Create a random set of weights."""
-    return {
-        'mobility': random.uniform(5, 30),
-        'corners': random.uniform(50, 150),
-        'corner_adjacent': random.uniform(20, 60),
-        'edges': random.uniform(1, 10),
-        'piece_count': random.uniform(0.5, 5),
-        'elo': ELO_START,
-    }
+def create_random_weights(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Create count random sets of weights."""
+    return rng.uniform(WEIGHTS_LOW, WEIGHTS_HIGH, (count, len(WEIGHT_KEYS)))
 
 
-def mutate_weights(weights: Dict) -> Dict:
-    """Mutate weights with some probability."""
-    new_weights = weights.copy()
-    for key in new_weights:
-        if key == 'elo':
-            continue
-        if random.random() < MUTATION_RATE:
-            # Add random variation
-            delta = random.uniform(-MUTATION_SCALE, MUTATION_SCALE) * new_weights[key]
-            new_weights[key] = max(0.1, new_weights[key] + delta)
-    return new_weights
-
-
-def crossover(weights1: Dict, weights2: Dict) -> Dict:
-    """Combine two sets of weights."""
-    new_weights = {}
-    for key in weights1:
-        if key == 'elo':
-            continue
-        if random.random() < 0.5:
-            new_weights[key] = weights1[key]
-        else:
-            new_weights[key] = weights2[key]
-    new_weights['elo'] = ELO_START
-    return new_weights
+def mutate_weights(weights: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Mutate each weight of each row with some probability."""
+    mask = rng.random(weights.shape) < MUTATION_RATE
+    # Add random variation
+    delta = rng.uniform(-MUTATION_SCALE, MUTATION_SCALE, weights.shape) * weights
+    return np.where(mask, np.maximum(0.1, weights + delta), weights)
+
 
+def crossover(weights1: np.ndarray, weights2: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Combine pairs of rows, taking each weight from either parent."""
+    mask = rng.random(weights1.shape) < 0.5
+    return np.where(mask, weights1, weights2)
 
-def _update_elo(weights_black: Dict, weights_white: Dict, result: int) -> None:
-    """Update ELO ratings in-place based on game result."""
-    elo_black = weights_black.get('elo', ELO_START)
-    elo_white = weights_white.get('elo', ELO_START)
 
-    expected_black = 1 / (1 + 10 ** ((elo_white - elo_black) / 400))
+def _update_elo(elo_black: float, elo_white: float, result: int) -> Tuple[float, float]:
+    """Return the new (black, white) ELO ratings based on game result."""
+    expected_black = 1.0 / (1.0 + math.exp(_LN10_OVER_400 * (elo_white - elo_black)))
     expected_white = 1 - expected_black
 
     score_black = 1.0 if result == 1 else 0.0 if result == -1 else 0.5
     score_white = 1.0 - score_black
 
-    weights_black['elo'] = elo_black + ELO_K * (score_black - expected_black)
-    weights_white['elo'] = elo_white + ELO_K * (score_white - expected_white)
+    return (
+        elo_black + ELO_K * (score_black - expected_black),
+        elo_white + ELO_K * (score_white - expected_white),
+    )
 
 
 def play_game(weights_black: Dict, weights_white: Dict, max_moves: int = 120) -> int:
     """
     Play a game between two weight configurations.
+
+    Does not touch the ELO ratings, so games can run in worker processes;
+    the caller applies the result with _update_elo.
     
     Returns:
         1 if black wins, -1 if white wins, 0 for draw
     """
     board = BoardState(user="trainer")
-    consecutive_passes = 0
     moves = 0
+    # Sides alternate on every move and every pass, so the weights of the side
+    # to move are swapped along with them instead of looked up each ply
+    weights_to_move, weights_waiting = weights_black, weights_white
+    # Local names load faster than globals inside the loop
+    choose, apply_move, legal_mask = choose_move, _apply_move_unchecked, legal_mask_nb
     
-    while consecutive_passes < 2 and moves < max_moves:
-        legal_moves = get_legal_moves(board)
-        
-        if not legal_moves:
+    while moves < max_moves:
+        # A full board or a side with no pieces left is over; don't wait for
+        # both sides to pass
+        if not board.black or not board.white or (board.black | board.white) == FULL_BOARD:
+            break
+
+        # Only emptiness matters here; choose_move generates its own moves
+        player_pieces, opponent_pieces = board.pieces()
+        if not legal_mask(player_pieces, opponent_pieces):
+            # If the other side can't move either the game is over; otherwise
+            # it moves next iteration, so passes never come two in a row
+            if not legal_mask(opponent_pieces, player_pieces):
+                break
             board = make_move(None, board)
-            consecutive_passes += 1
+            weights_to_move, weights_waiting = weights_waiting, weights_to_move
             continue
         
-        consecutive_passes = 0
         moves += 1
         
-        # Choose move based on current player
-        if board.next_player == Player.BLACK:
-            move = choose_move(board, depth=3, weights=weights_black)
-        else:
-            move = choose_move(board, depth=3, weights=weights_white)
-        
-        if move is None:
-            board = make_move(None, board)
-            consecutive_passes += 1
-        else:
-            board = make_move(move, board)
+        # choose_move returns a legal move whenever the side to move has one
+        move = choose(board, depth=SEARCH_DEPTH, weights=weights_to_move)
+        board = apply_move(move, board)
+        weights_to_move, weights_waiting = weights_waiting, weights_to_move
     
     # Count final pieces
-    black_count = bin(board.black).count('1')
-    white_count = bin(board.white).count('1')
+    black_count = board.black.bit_count()
+    white_count = board.white.bit_count()
     
     if black_count > white_count:
         result = 1
@@ -167,38 +193,62 @@ def play_game(weights_black: Dict, weights_white: Dict, max_moves: int = 120) ->
     else:
         result = 0
 
-    _update_elo(weights_black, weights_white, result)
-    result_label = "B" if result == 1 else "W" if result == -1 else "D"
-    print(
-        f"game B[{_compact_weights(weights_black)}] "
-        f"W[{_compact_weights(weights_white)}] => {result_label}"
-    )
-
     return result
 
 
-def evaluate_fitness(weights: Dict, opponents: List[Dict]) -> float:
+def _init_worker() -> None:
+    """Prepare a game worker process."""
+    # Ctrl+C is handled by signal_handler in the parent, which saves the weights
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _play_game_worker(matchup: Tuple[Dict, Dict]) -> int:
+    if not HAVE_NUMBA:
+        return play_game(*matchup)
+    # Play the whole game in compiled code; same result convention as play_game
+    weights_black, weights_white = matchup
+    return play_game_nb(
+        BoardState.DEFAULT_BLACK, BoardState.DEFAULT_WHITE,
+        _weight_tuple(weights_black), _weight_tuple(weights_white),
+        SEARCH_DEPTH, int.from_bytes(os.urandom(8), 'little'),
+    )
+
+
+def play_rated_games(population: np.ndarray, elo: np.ndarray, executor: Executor,
+                     generation: int) -> None:
     """
-    Evaluate fitness of weights by playing against opponents.
-    
-    Returns:
-        Fitness score (higher is better)
+    Play one rated game for every individual and update elo in-place.
+
+    Swiss-style pairing: individuals are ranked by ELO and each plays its
+    neighbour in the ranking, so games are between similar ratings where the
+    result says the most. The higher-rated side of each pair plays black on
+    even generations and white on odd ones. With an odd population the
+    lowest-rated individual sits out. All games are independent, so they are
+    played by the executor; ratings are updated here, in order, as the
+    results come back.
     """
-    total_score = 0
-    games_played = 0
-    
-    for opponent in opponents:
-        # Play as black
-        result = play_game(weights, opponent)
-        total_score += result
-        games_played += 1
-        
-        # Play as white
-        result = play_game(opponent, weights)
-        total_score -= result  # Negate because we're white
-        games_played += 1
-    
-    return total_score / games_played if games_played > 0 else 0
+    ranking = np.argsort(-elo, kind='stable').tolist()
+    pairs = zip(ranking[0::2], ranking[1::2])
+    if generation % 2:
+        pairs = [(lower, higher) for higher, lower in pairs]
+    matchups = list(pairs)
+
+    weights = [_weights_dict(row) for row in population]
+    games = [(weights[black], weights[white]) for black, white in matchups]
+    log = []
+    # Rate with plain floats; NumPy scalar arithmetic is slower per game
+    ratings = elo.tolist()
+    for (black, white), result in zip(matchups, executor.map(_play_game_worker, games)):
+        ratings[black], ratings[white] = _update_elo(ratings[black], ratings[white], result)
+        if VERBOSE:
+            result_label = "B" if result == 1 else "W" if result == -1 else "D"
+            log.append(
+                f"game B[{_compact_weights(population[black], ratings[black])}] "
+                f"W[{_compact_weights(population[white], ratings[white])}] => {result_label}\n"
+            )
+
+    elo[:] = ratings
+    sys.stdout.write(''.join(log))
 
 
 def train():
@@ -213,12 +263,14 @@ def train():
     print(f"Best weights will be saved to {BEST_WEIGHTS_FILE}")
     print(f"Press Ctrl+C to stop training and save best weights\n")
     
+    rng = np.random.default_rng()
+
     # Try to restore from saved state
     start_generation = 0
     try:
         with open('state.json', 'r') as f:
             state = json.load(f)
-            population = state['population']
+            population, elo = _population_arrays(state['population'])
             best_weights = state['best_weights']
             best_fitness = state['best_fitness']
             start_generation = state['generation']
@@ -228,60 +280,67 @@ def train():
     except FileNotFoundError:
         print("No saved state found, starting fresh\n")
         # Initialize population
-        seed = DEFAULT_WEIGHTS.copy()
-        seed['elo'] = ELO_START
-        population = [seed] + [create_random_weights() for _ in range(POPULATION_SIZE - 1)]
+        seed = np.array([DEFAULT_WEIGHTS[key] for key in WEIGHT_KEYS])
+        population = np.vstack([seed, create_random_weights(rng, POPULATION_SIZE - 1)])
+        elo = np.full(POPULATION_SIZE, ELO_START)
     
+    # Games are CPU-bound tree searches, so play them on every core. Workers
+    # are spawned rather than forked: forking after numba has started its
+    # threading layer hangs the parent at exit. Spawned workers also seed
+    # their own RNGs, so they don't all break ties the same way.
+    executor = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
     for generation in range(start_generation, GENERATIONS):
         print(f"Generation {generation + 1}/{GENERATIONS}")
         
-        # Evaluate fitness for each individual
-        fitness_scores = []
-        for i, weights in enumerate(population):
-            # Play against a random subset of the population
-            opponents = random.sample([w for j, w in enumerate(population) if j != i], 
-                                     min(5, len(population) - 1))
-            fitness = evaluate_fitness(weights, opponents)
-            fitness_scores.append((fitness, weights))
-            
-            # Track best
-            if fitness > best_fitness:
-                best_fitness = fitness
-                best_weights = weights.copy()
-        
-        # Sort by fitness
-        fitness_scores.sort(reverse=True, key=lambda x: x[0])
+        # Fitness is the ELO rating, after this generation's games
+        play_rated_games(population, elo, executor, generation)
+        fitness = elo
+
+        # Sort by fitness; stable, so ties keep population order
+        order = np.argsort(-fitness, kind='stable')
+        best = order[0]
+        best_generation_weights = _weights_dict(population[best], elo[best])
+
+        # Track best
+        if fitness[best] > best_fitness:
+            best_fitness = float(fitness[best])
+            best_weights = best_generation_weights
         
         # Report progress
-        avg_fitness = sum(f for f, _ in fitness_scores) / len(fitness_scores)
-        print(f"  Best fitness: {fitness_scores[0][0]:.3f}")
-        print(f"  Avg fitness:  {avg_fitness:.3f}")
-        print(f"  Best weights: {json.dumps(fitness_scores[0][1], indent=None)}")
+        print(f"  Best fitness: {fitness[best]:.3f}")
+        print(f"  Avg fitness:  {fitness.mean():.3f}")
+        print(f"  Best weights: {json.dumps(best_generation_weights, indent=None)}")
         
         # Save best weights and training state
-        save_best_weights(fitness_scores[0][1], fitness_scores[0][0], generation + 1, population)
+        save_best_weights(best_generation_weights, float(fitness[best]), generation + 1,
+                          _population_dicts(population, elo))
         
         # Create next generation
-        new_population = []
-        
+
         # Elitism: keep top 20%
         elite_count = max(2, POPULATION_SIZE // 5)
-        for _, weights in fitness_scores[:elite_count]:
-            new_population.append(weights.copy())
-        
-        # Breed the rest
-        while len(new_population) < POPULATION_SIZE:
-            # Tournament selection
-            parent1 = random.choice(fitness_scores[:POPULATION_SIZE // 2])[1]
-            parent2 = random.choice(fitness_scores[:POPULATION_SIZE // 2])[1]
-            
-            # Crossover and mutation
-            child = crossover(parent1, parent2)
-            child = mutate_weights(child)
-            new_population.append(child)
-        
-        population = new_population
+        elites = order[:elite_count]
+
+        # Breed the rest: tournament selection from the top half, then
+        # crossover and mutation. Sizes come from the population actually
+        # evaluated, which can differ from POPULATION_SIZE after a resume;
+        # breeding fills it back up to POPULATION_SIZE.
+        child_count = POPULATION_SIZE - len(elites)
+        parent_pool = max(1, len(order) // 2)
+        parents = order[rng.integers(0, parent_pool, (child_count, 2))]
+        children = crossover(population[parents[:, 0]], population[parents[:, 1]], rng)
+        children = mutate_weights(children, rng)
+
+        population = np.vstack([population[elites], children])
+        elo = np.concatenate([elo[elites], np.full(child_count, ELO_START)])
         print()
+
+    executor.shutdown()
     
     print("Training complete!")
     print(f"Final best fitness: {best_fitness:.3f}")